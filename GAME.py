@@ -1,18 +1,27 @@
 import pygame
 import sys
 import random
+import argparse
+import gc
+import os
+import time
 
-# Initialize Pygame
-pygame.init()
+from frame_profiler import FrameProfiler
+from sprite_pool import PooledSprite, SpritePool, GCMonitor, frame_time_stats
 
 # Set up the game window
 screen_width, screen_height = 800, 600
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Platformer Game with Enemies and Coins")
 
 # Set frame rate
-FPS = 60  # Cap the frame rate at 60 FPS
-clock = pygame.time.Clock()
+FPS = 60  # Default render rate cap (0 renders uncapped)
+
+# The world always advances in fixed steps of TICK seconds, so every counter and speed
+# below (spawn timers, appearance delays, pixels per step) is in real time, whatever the render rate
+UPDATE_RATE = 60
+TICK = 1.0 / UPDATE_RATE
+MAX_FRAME_TIME = 0.25  # Drop time beyond this after a stall instead of trying to catch up
+
+POOL_SIZE = 32  # Idle sprites kept per type for reuse (0 creates a new sprite for every spawn)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -20,38 +29,74 @@ RED = (255, 0, 0)
 BLACK = (0, 0, 0)
 GOLD = (255, 215, 0)
 
-# Load images
-try:
-    player_image = pygame.image.load("hero.png").convert_alpha()  # Load hero image
-    enemy_image = pygame.image.load("enemy.png").convert_alpha()  # Load enemy image
-    bg_image = pygame.image.load("background.png").convert()  # Load background image
-    coin_image = pygame.image.load("coin.png").convert_alpha()    # Load coin image
-    platform_image = pygame.image.load("platform.png").convert_alpha()  # Load platform image
-except pygame.error as e:
-    print(f"Error loading image: {e}")
-    sys.exit()
 
-# Scale the images to increase the size
-player_image = pygame.transform.scale(player_image, (80, 80))  # Increased player size to 80x80
-enemy_image = pygame.transform.scale(enemy_image, (80, 80))    # Increased enemy size to 80x80
-bg_image = pygame.transform.scale(bg_image, (screen_width, screen_height))  # Scale background
-coin_image = pygame.transform.scale(coin_image, (30, 30))      # Keep coin size the same
+# Load images (needs a display mode to be set first because of convert/convert_alpha)
+def load_images():
+    try:
+        player_image = pygame.image.load("hero.png").convert_alpha()  # Load hero image
+        enemy_image = pygame.image.load("enemy.png").convert_alpha()  # Load enemy image
+        bg_image = pygame.image.load("background.png").convert()  # Load background image
+        coin_image = pygame.image.load("coin.png").convert_alpha()    # Load coin image
+        platform_image = pygame.image.load("platform.png").convert_alpha()  # Load platform image
+    except pygame.error as e:
+        print(f"Error loading image: {e}")
+        sys.exit()
+
+    # Scale the images to increase the size
+    return {
+        "player": pygame.transform.scale(player_image, (80, 80)),  # Increased player size to 80x80
+        "enemy": pygame.transform.scale(enemy_image, (80, 80)),    # Increased enemy size to 80x80
+        "background": pygame.transform.scale(bg_image, (screen_width, screen_height)),  # Scale background
+        "coin": pygame.transform.scale(coin_image, (30, 30)),      # Keep coin size the same
+        "platform": platform_image,
+    }
+
+
+# Plain coloured surfaces with the same sizes, so the world can run without any image files or display
+def placeholder_images():
+    images = {}
+    for name, size, color in (
+        ("player", (80, 80), WHITE),
+        ("enemy", (80, 80), RED),
+        ("background", (screen_width, screen_height), BLACK),
+        ("coin", (30, 30), GOLD),
+        ("platform", (150, 20), (128, 128, 128)),
+    ):
+        images[name] = pygame.Surface(size)
+        images[name].fill(color)
+    return images
+
+
+# Player input for a single frame, either read from the keyboard or supplied by an agent/test
+class Inputs:
+    def __init__(self, left=False, right=False, jump=False, shoot=False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+        self.shoot = shoot
+
+    @classmethod
+    def from_keyboard(cls, shoot=False):
+        keys = pygame.key.get_pressed()
+        return cls(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_SPACE], shoot)
+
 
 # Define the Platform class with image
-class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height):
+class Platform(PooledSprite):
+    def __init__(self, x, y, width, height, image):
         super().__init__()
-        try:
-            self.image = pygame.image.load("platform.png").convert_alpha()  # Load platform image
-            self.image = pygame.transform.scale(self.image, (width, height))  # Scale to platform size
-        except pygame.error:
-            print("Error loading platform image, using fallback.")
-            self.image = pygame.Surface((width, height))
-            self.image.fill((128, 128, 128))  # Fallback color (gray) if image is not available
+        self.image = pygame.transform.scale(image, (width, height))  # Scale to platform size
         self.rect = self.image.get_rect()
+        self.speed = 2  # Speed at which platforms move to the left
+        self.reset(x, y, width, height, image)
+
+    def reset(self, x, y, width, height, image):
+        if self.image.get_size() != (width, height):
+            self.image = pygame.transform.scale(image, (width, height))
+            self.rect.size = (width, height)
         self.rect.x = x
         self.rect.y = y
-        self.speed = 2  # Speed at which platforms move to the left
+        self.prev_pos = self.rect.topleft
 
     def update(self):
         self.rect.x -= self.speed
@@ -60,9 +105,10 @@ class Platform(pygame.sprite.Sprite):
 
 # Define the Player class
 class Player(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, world):
         super().__init__()
-        self.image = player_image  # Use the hero image
+        self.world = world
+        self.image = world.images["player"]  # Use the hero image
         self.rect = self.image.get_rect()
         self.rect.x = 100
         self.rect.y = screen_height - 150
@@ -74,30 +120,30 @@ class Player(pygame.sprite.Sprite):
         self.score = 0
 
     def update(self):
-        keys = pygame.key.get_pressed()
-        
+        inputs = self.world.inputs
+
         # Horizontal movement
-        if keys[pygame.K_LEFT]:
+        if inputs.left:
             self.velocity_x = -5
-        elif keys[pygame.K_RIGHT]:
+        elif inputs.right:
             self.velocity_x = 5
         else:
             self.velocity_x = 0
 
         # Jumping
-        if not self.is_jumping and keys[pygame.K_SPACE]:
+        if not self.is_jumping and inputs.jump:
             self.is_jumping = True
             self.velocity_y = -15
 
         # Gravity effect
         self.velocity_y += 1
-        
+
         # Update player position
         self.rect.x += self.velocity_x
         self.rect.y += self.velocity_y
-        
+
         # Check if player collides with a platform while falling
-        platform_hit = pygame.sprite.spritecollide(self, platforms, False)
+        platform_hit = pygame.sprite.spritecollide(self, self.world.platforms, False)
         if platform_hit and self.velocity_y > 0:
             self.rect.y = platform_hit[0].rect.top - self.rect.height  # Place player on top of the platform
             self.is_jumping = False
@@ -115,21 +161,25 @@ class Player(pygame.sprite.Sprite):
             self.rect.x = screen_width - 50
 
     def shoot(self):
-        if len(all_projectiles) < 5:
-            projectile = Projectile(self.rect.x + 50, self.rect.y + 25)
-            all_projectiles.add(projectile)
-            all_sprites.add(projectile)
+        if len(self.world.all_projectiles) < 5:
+            projectile = self.world.pools["projectile"].acquire(self.rect.x + 50, self.rect.y + 25)
+            self.world.all_projectiles.add(projectile)
+            self.world.all_sprites.add(projectile)
 
 # Define the Projectile class
-class Projectile(pygame.sprite.Sprite):
+class Projectile(PooledSprite):
     def __init__(self, x, y):
         super().__init__()
         self.image = pygame.Surface((10, 5))
         self.image.fill(RED)
         self.rect = self.image.get_rect()
+        self.speed = 10
+        self.reset(x, y)
+
+    def reset(self, x, y):
         self.rect.x = x
         self.rect.y = y
-        self.speed = 10
+        self.prev_pos = self.rect.topleft
 
     def update(self):
         self.rect.x += self.speed
@@ -137,19 +187,23 @@ class Projectile(pygame.sprite.Sprite):
             self.kill()
 
 # Define the Enemy class with updated position to be on the same level as the coins
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, platform):
+class Enemy(PooledSprite):
+    def __init__(self, platform, world):
         super().__init__()
-        self.image = enemy_image  # Use enemy image
+        self.image = world.images["enemy"]  # Use enemy image
         self.rect = self.image.get_rect()
+        self.reset(platform, world)
+
+    def reset(self, platform, world):
         self.platform = platform
-        self.rect.x = platform.rect.x + random.randint(50, 100)  # Set enemy on the platform horizontally
+        self.rect.x = platform.rect.x + world.rng.randint(50, 100)  # Set enemy on the platform horizontally
 
         # Place the enemy slightly above the platform like the coins
         self.rect.y = platform.rect.y - 80  # Adjust Y position so enemy is on top of platform like the coins
 
-        self.appearance_delay = random.randint(60, 120)  # Delay appearance (1-2 seconds)
+        self.appearance_delay = world.rng.randint(60, 120)  # Delay appearance (1-2 seconds)
         self.appeared = False
+        self.prev_pos = self.rect.topleft
 
     def update(self):
         if not self.appeared:
@@ -164,22 +218,27 @@ class Enemy(pygame.sprite.Sprite):
                 self.kill()
 
 # Define the Coin class, appearing on the platforms
-class Coin(pygame.sprite.Sprite):
-    def __init__(self, platform, enemy_positions):
+class Coin(PooledSprite):
+    def __init__(self, platform, x, world):
         super().__init__()
-        self.image = coin_image  # Use the coin image
+        self.image = world.images["coin"]  # Use the coin image
         self.rect = self.image.get_rect()
-        self.platform = platform
-        
-        # Ensure the coin doesn't spawn where an enemy is
-        while True:
-            self.rect.x = platform.rect.x + random.randint(50, 100)  # Set coin on the platform
-            self.rect.y = platform.rect.y - 30  # Coin slightly above the platform
+        self.reset(platform, x, world)
 
-            # Check if the coin's position overlaps with any enemy
-            overlap = any(abs(self.rect.x - ex) < 40 for ex in enemy_positions)
-            if not overlap:
-                break  # Break loop if no overlap with enemy
+    def reset(self, platform, x, world):
+        self.world = world
+        self.platform = platform
+        self.rect.x = x  # Set coin on the platform
+        self.rect.y = platform.rect.y - 30  # Coin slightly above the platform
+        self.prev_pos = self.rect.topleft
+
+    # Pick a spot on the platform that doesn't overlap any enemy, or None if there is no room.
+    # (Retrying random spots forever hangs the game when an enemy sits in the middle of the platform.)
+    @staticmethod
+    def free_position(platform, enemy_positions, rng):
+        free = [platform.rect.x + offset for offset in range(50, 101)
+                if all(abs(platform.rect.x + offset - ex) >= 40 for ex in enemy_positions)]
+        return rng.choice(free) if free else None
 
     def update(self):
         self.rect.x -= 2  # Move left with the platform
@@ -187,128 +246,280 @@ class Coin(pygame.sprite.Sprite):
             self.kill()
 
         # Check if player collects the coin
-        if pygame.sprite.collide_rect(self, player):
-            player.score += 10  # Increase score when coin is collected
+        if pygame.sprite.collide_rect(self, self.world.player):
+            self.world.player.score += 10  # Increase score when coin is collected
             self.kill()  # Remove coin once collected
 
-# Scroll the background
-def scroll_background(bg_x, speed):
-    screen.blit(bg_image, (bg_x, 0))
-    screen.blit(bg_image, (bg_x + screen_width, 0))
-    bg_x -= speed
-    if bg_x <= -screen_width:
-        bg_x = 0
-    return bg_x
-
-# Game Over function
-def game_over():
-    font = pygame.font.SysFont(None, 75)
-    text = font.render('Game Over', True, RED)
-    screen.blit(text, (screen_width // 2 - 150, screen_height // 2 - 50))
-    pygame.display.flip()
-    pygame.time.wait(2000)
-    pygame.quit()
-    sys.exit()
-
-# Initialize sprite groups
-all_sprites = pygame.sprite.Group()
-all_projectiles = pygame.sprite.Group()
-all_enemies = pygame.sprite.Group()
-all_coins = pygame.sprite.Group()
-platforms = pygame.sprite.Group()  # Platform group for jumping
-
-# Create the player
-player = Player()
-all_sprites.add(player)
-
-# Main game loop
-bg_x = 0  # Initial background x position
-platform_spawn_timer = 0
-running = True
-while running:
-    clock.tick(FPS)  # Ensure the game runs at 60 FPS
-
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_x:  # Shoot with 'X'
-                player.shoot()
-
-    # Background motion
-    bg_x = scroll_background(bg_x, 2)
+# The whole game state; step() advances it by exactly one frame and never touches the display
+class World:
+    def __init__(self, seed=None, images=None, pool_size=POOL_SIZE, profiler=None):
+        self.rng = random.Random(seed)  # Seeded RNG for platform, enemy and coin spawning
+        self.images = images if images is not None else placeholder_images()
+        self.inputs = Inputs()
+        self.frame = 0
+        self.game_over = False
+        self.profiler = profiler if profiler is not None else FrameProfiler()  # Disabled unless one is passed in
+
+        # Initialize sprite groups
+        self.all_sprites = pygame.sprite.Group()
+        self.all_projectiles = pygame.sprite.Group()
+        self.all_enemies = pygame.sprite.Group()
+        self.all_coins = pygame.sprite.Group()
+        self.platforms = pygame.sprite.Group()  # Platform group for jumping
+
+        # Killed sprites go back to these pools and are reused by the next spawn
+        self.pools = {
+            "platform": SpritePool(Platform, pool_size),
+            "projectile": SpritePool(Projectile, pool_size),
+            "enemy": SpritePool(Enemy, pool_size),
+            "coin": SpritePool(Coin, pool_size),
+        }
+
+        # Create the player
+        self.player = Player(self)
+        self.all_sprites.add(self.player)
+
+        self.bg_x = 0  # Initial background x position
+        self.prev_bg_x = 0
+        self.platform_spawn_timer = 0
+
+    def step(self, inputs):
+        if self.game_over:
+            return
+        self.inputs = inputs
+        self.frame += 1
+
+        # Remember where everything was so draw() can interpolate between the last two steps
+        self.prev_bg_x = self.bg_x
+        for sprite in self.all_sprites:
+            sprite.prev_pos = sprite.rect.topleft
+
+        if inputs.shoot:  # Shoot with 'X'
+            self.player.shoot()
+
+        # Background motion
+        self.bg_x -= 2
+        if self.bg_x <= -screen_width:
+            self.bg_x = 0
+
+        self.spawn()
+
+        # Update all sprites
+        self.all_sprites.update()
+        self.profiler.mark("update")
+
+        # Check collisions between projectiles and enemies
+        for projectile in self.all_projectiles:
+            enemy_hit = pygame.sprite.spritecollide(projectile, self.all_enemies, True)
+            if enemy_hit:
+                self.player.score += 50  # Add score for each enemy defeated
+                projectile.kill()
+
+        # Check collisions between player and enemies (lose health)
+        if pygame.sprite.spritecollide(self.player, self.all_enemies, True):
+            self.player.health -= 10
+            if self.player.health <= 0:
+                self.player.lives -= 1
+                self.player.health = 100
+                if self.player.lives == 0:
+                    self.game_over = True
+        self.profiler.mark("collisions")
 
     # Spawn platforms, enemies, and coins (with reduced frequency)
-    platform_spawn_timer += 1
-    if platform_spawn_timer > 120:  # Slightly reduced frequency of new platforms
-        platform_spawn_timer = 0
-        new_platform = Platform(screen_width, random.randint(300, 500), 150, 20)
-        platforms.add(new_platform)
-        all_sprites.add(new_platform)
+    def spawn(self):
+        self.platform_spawn_timer += 1
+        if self.platform_spawn_timer <= 120:  # Slightly reduced frequency of new platforms
+            return
+        self.platform_spawn_timer = 0
+        new_platform = self.pools["platform"].acquire(screen_width, self.rng.randint(300, 500), 150, 20,
+                                                      self.images["platform"])
+        self.platforms.add(new_platform)
+        self.all_sprites.add(new_platform)
 
         # Track enemy positions to prevent coin overlap
         enemy_positions = []
 
         # Spawn enemies with delay on the platform
-        if random.random() < 0.5:  # 50% chance to spawn an enemy on the platform
-            new_enemy = Enemy(new_platform)
+        if self.rng.random() < 0.5:  # 50% chance to spawn an enemy on the platform
+            new_enemy = self.pools["enemy"].acquire(new_platform, self)
             enemy_positions.append(new_enemy.rect.x)  # Store enemy position
-            all_enemies.add(new_enemy)
-            all_sprites.add(new_enemy)
+            self.all_enemies.add(new_enemy)
+            self.all_sprites.add(new_enemy)
 
         # Spawn coins without overlapping enemies
-        if random.random() < 0.4:  # Slightly lower chance to spawn a coin on the platform
-            new_coin = Coin(new_platform, enemy_positions)
-            all_coins.add(new_coin)
-            all_sprites.add(new_coin)
-
-    # Update all sprites
-    all_sprites.update()
-
-    # Check collisions between projectiles and enemies
-    for projectile in all_projectiles:
-        enemy_hit = pygame.sprite.spritecollide(projectile, all_enemies, True)
-        if enemy_hit:
-            player.score += 50  # Add score for each enemy defeated
-            projectile.kill()
-
-    # Check collisions between player and enemies (lose health)
-    if pygame.sprite.spritecollide(player, all_enemies, True):
-        player.health -= 10
-        if player.health <= 0:
-            player.lives -= 1
-            player.health = 100
-            if player.lives == 0:
-                game_over()
-
-    # Drawing
-    all_sprites.draw(screen)
-
-    # Display health, lives, and score
-    font = pygame.font.SysFont(None, 36)
-    health_text = font.render(f'Health: {player.health}', True, WHITE)
-    lives_text = font.render(f'Lives: {player.lives}', True, WHITE)
-    score_text = font.render(f'Score: {player.score}', True, WHITE)
-    screen.blit(health_text, (10, 10))
-    screen.blit(lives_text, (10, 40))
-    screen.blit(score_text, (10, 70))
-
-    # Update display
-    pygame.display.flip()
-
-# Exit Pygame
-pygame.quit()
-sys.exit()
-
-
-
-
-
-
+        if self.rng.random() < 0.4:  # Slightly lower chance to spawn a coin on the platform
+            coin_x = Coin.free_position(new_platform, enemy_positions, self.rng)
+            if coin_x is not None:
+                new_coin = self.pools["coin"].acquire(new_platform, coin_x, self)
+                self.all_coins.add(new_coin)
+                self.all_sprites.add(new_coin)
+
+    # alpha is how far (0..1) the render time is between the previous step and the current one
+    def draw(self, screen, font, alpha=1.0):
+        # Scroll the background (no interpolation across the wrap-around)
+        bg_x = self.bg_x
+        if self.prev_bg_x >= self.bg_x:
+            bg_x = self.prev_bg_x + (self.bg_x - self.prev_bg_x) * alpha
+        bg_image = self.images["background"]
+        screen.blit(bg_image, (bg_x, 0))
+        screen.blit(bg_image, (bg_x + screen_width, 0))
+
+        for sprite in self.all_sprites:
+            x, y = sprite.rect.topleft
+            prev_x, prev_y = getattr(sprite, "prev_pos", (x, y))  # Sprites spawned this step have no previous position
+            screen.blit(sprite.image, (prev_x + (x - prev_x) * alpha, prev_y + (y - prev_y) * alpha))
+
+        # Display health, lives, and score
+        health_text = font.render(f'Health: {self.player.health}', True, WHITE)
+        lives_text = font.render(f'Lives: {self.player.lives}', True, WHITE)
+        score_text = font.render(f'Score: {self.player.score}', True, WHITE)
+        screen.blit(health_text, (10, 10))
+        screen.blit(lives_text, (10, 40))
+        screen.blit(score_text, (10, 70))
+
+    def pool_stats(self):
+        return [pool.stats() for pool in self.pools.values()]
+
+    # Compact summary used to compare runs with the same seed
+    def snapshot(self):
+        return (self.frame, self.player.rect.x, self.player.rect.y, self.player.health,
+                self.player.lives, self.player.score, len(self.all_sprites))
 
+# Game Over function
+def game_over(screen):
+    font = pygame.font.SysFont(None, 75)
+    text = font.render('Game Over', True, RED)
+    screen.blit(text, (screen_width // 2 - 150, screen_height // 2 - 50))
+    pygame.display.flip()
+    pygame.time.wait(2000)
 
+# Run the world without a renderer as fast as possible, e.g. for load tests and balance tuning
+def simulate(frames, seed=0, policy=None):
+    world = World(seed)
+    rng = random.Random(seed)
+    idle = Inputs()
+    for _ in range(frames):
+        world.step(policy(world, rng) if policy else idle)
+        if world.game_over:
+            break
+    return world
+
+# Time every step of a headless run and every GC pause during it, with and without pooling.
+# The world restarts on game over; pool statistics are summed over all restarts.
+def gc_report(frames, seed=0):
+    for label, pool_size in (("without pooling", 0), ("with pooling", POOL_SIZE)):
+        gc.collect()  # Don't bill this run for the previous run's garbage
+        worlds = [World(seed, pool_size=pool_size)]
+        rng = random.Random(seed)
+        monitor = GCMonitor()
+        frame_times = []
+        monitor.start()
+        try:
+            for _ in range(frames):
+                inputs = random_policy(worlds[-1], rng)
+                start = time.perf_counter()
+                worlds[-1].step(inputs)
+                frame_times.append(time.perf_counter() - start)
+                if worlds[-1].game_over:
+                    worlds.append(World(seed, pool_size=pool_size))
+        finally:
+            monitor.stop()
+        print(f"{label} ({len(worlds)} games)")
+        print(f"  frame times: {frame_time_stats(frame_times)}")
+        print(f"  gc pauses:   {monitor.summary()}")
+        for pools in zip(*(world.pool_stats() for world in worlds)):
+            totals = {key: sum(stats[key] for stats in pools) for key in ("created", "reused", "dropped")}
+            print(f"  {pools[0]['type']:<10} pool: {totals}")
+
+# Simple scripted agent: runs right, jumps and shoots at random
+def random_policy(world, rng):
+    return Inputs(left=rng.random() < 0.2, right=rng.random() < 0.5,
+                  jump=rng.random() < 0.05, shoot=rng.random() < 0.1)
+
+def main(seed=None, render_fps=FPS, profiler=None):
+    # Initialize Pygame
+    pygame.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Platformer Game with Enemies and Coins")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 36)
 
+    profiler = profiler if profiler is not None else FrameProfiler()
+    world = World(seed, load_images(), profiler=profiler)
+
+    # Main game loop: fixed-timestep updates driven by an accumulator, rendering as often as render_fps allows
+    accumulator = 0.0
+    previous_time = time.perf_counter()
+    shoot = False  # Kept until a step consumes it, in case no step runs this frame
+    running = True
+    while running:
+        profiler.begin_frame()
+        clock.tick(render_fps)  # 0 means uncapped
+        profiler.mark("wait")
+
+        now = time.perf_counter()
+        accumulator += min(now - previous_time, MAX_FRAME_TIME)
+        previous_time = now
+
+        # Event handling
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_x:  # Shoot with 'X'
+                    shoot = True
+                elif event.key == pygame.K_F3:  # Toggle the profiler overlay
+                    profiler.toggle_overlay()
+        profiler.mark("events")
+
+        while accumulator >= TICK and not world.game_over:
+            world.step(Inputs.from_keyboard(shoot))
+            shoot = False
+            accumulator -= TICK
+
+        # Drawing
+        world.draw(screen, font, min(accumulator / TICK, 1.0))
+        profiler.draw(screen, budget_ms=1000 / UPDATE_RATE)
+        profiler.mark("draw")
+
+        # Update display
+        pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
+
+        if world.game_over:
+            game_over(screen)
+            running = False
 
+    profiler.close()
 
+    # Exit Pygame
+    pygame.quit()
+    sys.exit()
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Platformer Game with Enemies and Coins")
+    parser.add_argument("--seed", type=int, default=None, help="seed for platform, enemy and coin spawning")
+    parser.add_argument("--render-fps", type=int, default=FPS,
+                        help="render rate cap, 0 for uncapped (game speed does not depend on it)")
+    parser.add_argument("--headless", type=int, metavar="FRAMES",
+                        help="simulate FRAMES frames without a window and report frames per second")
+    parser.add_argument("--gc-report", type=int, metavar="FRAMES",
+                        help="compare frame time spikes and GC pauses with and without sprite pooling")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each phase of the loop and print p50/p95/p99 on exit (F3 shows the overlay)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="write per-frame phase timings to a CSV file")
+    args = parser.parse_args()
+
+    if args.gc_report:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        gc_report(args.gc_report, args.seed or 0)
+    elif args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        start = time.perf_counter()
+        world = simulate(args.headless, args.seed or 0, random_policy)
+        elapsed = time.perf_counter() - start
+        print(f"{world.frame} frames in {elapsed:.2f}s ({world.frame / elapsed:.0f} frames/s), "
+              f"score {world.player.score}, lives {world.player.lives}")
+    else:
+        main(args.seed, args.render_fps, FrameProfiler(enabled=args.profile, csv_path=args.profile_csv))
@@ -0,0 +1,191 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Batched version of the Player/Enemy model from the notebook: every player has position, health and
+# lives, and is hunted by one enemy with position and health. Each step all players move one square in
+# a random direction (Player.move), all enemies close in, and adjacent pairs trade attacks
+# (Enemy.attack_player). Losing all health costs a life and refills health, as in GAME.py.
+
+# Player.move directions (right, left, up, down) as x and y steps; entries 4-7 keep dead players still
+STEP_X = np.array([1, -1, 0, 0, 0, 0, 0, 0], np.int16)
+STEP_Y = np.array([0, 0, -1, 1, 0, 0, 0, 0], np.int16)
+
+# Health, damage, lives and score are int32; positions are int16, so the arena has to leave room
+# for the distance between a player and its enemy
+MAX_VALUE = np.iinfo(np.int32).max
+MAX_ARENA = np.iinfo(np.int16).max // 2
+
+
+# Tunable numbers for one simulation run
+class BalanceSettings:
+    def __init__(self, enemy_damage=10, player_health=100, lives=3, enemy_health=50, player_damage=25,
+                 enemy_hit_chance=0.5, player_hit_chance=0.5, kill_score=50, arena=10):
+        self.enemy_damage = enemy_damage  # Enemy.attack_player takes 10 health
+        self.player_health = player_health
+        self.lives = lives
+        self.enemy_health = enemy_health
+        self.player_damage = player_damage
+        self.enemy_hit_chance = enemy_hit_chance  # Chance per step that an adjacent enemy lands a hit
+        self.player_hit_chance = player_hit_chance
+        self.kill_score = kill_score  # Score for defeating an enemy, as in GAME.py
+        self.arena = arena  # Positions stay within -arena..arena on both axes
+
+        # Checked here so a bad value in a sweep fails with a clear message instead of overflowing
+        for name, low, high in (("enemy_damage", 0, MAX_VALUE), ("player_health", 1, MAX_VALUE),
+                                ("lives", 0, MAX_VALUE), ("enemy_health", 1, MAX_VALUE),
+                                ("player_damage", 0, MAX_VALUE), ("kill_score", 0, MAX_VALUE),
+                                ("enemy_hit_chance", 0, 1), ("player_hit_chance", 0, 1), ("arena", 0, MAX_ARENA)):
+            value = getattr(self, name)
+            if not low <= value <= high:
+                raise ValueError(f"{name} must be between {low} and {high}, got {value}")
+
+    def __repr__(self):
+        return (f"damage={self.enemy_damage} health={self.player_health} lives={self.lives} "
+                f"enemy_health={self.enemy_health} player_damage={self.player_damage}")
+
+
+# Outcome of every simulated player: step of death (steps if still alive), score and lives left
+class BalanceResult:
+    def __init__(self, settings, steps, survival, scores, lives):
+        self.settings = settings
+        self.steps = steps
+        self.survival = survival
+        self.scores = scores
+        self.lives = lives
+
+    @classmethod
+    def merge(cls, results):
+        first = results[0]
+        return cls(first.settings, first.steps,
+                   np.concatenate([r.survival for r in results]),
+                   np.concatenate([r.scores for r in results]),
+                   np.concatenate([r.lives for r in results]))
+
+    # Death-step percentiles only cover players who lost their last life (None if nobody did);
+    # survivors are counted in survival_rate instead
+    def summary(self):
+        survived = self.lives > 0
+        died = self.survival[~survived]
+        return {
+            "players": len(self.survival),
+            "survival_rate": float(survived.mean()),
+            "death_step_p10_p50_p90": np.percentile(died, [10, 50, 90]).tolist() if len(died) else None,
+            "score_mean": float(self.scores.mean()),
+            "score_p10_p50_p90": np.percentile(self.scores, [10, 50, 90]).tolist(),
+            "lives_left": np.bincount(self.lives, minlength=self.settings.lives + 1).tolist(),
+        }
+
+
+# Simulate one batch of players in this process. Positions are int16, health and lives int32, and random numbers
+# for attacks are only drawn for the few players that are next to their enemy.
+def simulate(settings, players, steps, seed):
+    s = settings
+    rng = np.random.default_rng(seed)
+    player_x = np.zeros(players, np.int16)  # Player starts at [0, 0]
+    player_y = np.zeros(players, np.int16)
+    health = np.full(players, s.player_health, np.int32)
+    lives = np.full(players, s.lives, np.int32)
+    scores = np.zeros(players, np.int32)
+    survival = np.full(players, steps if s.lives > 0 else 0, np.int32)  # With no lives, players are out at step 0
+    enemy_x = rng.integers(-s.arena, s.arena + 1, players, dtype=np.int16)
+    enemy_y = rng.integers(-s.arena, s.arena + 1, players, dtype=np.int16)
+    enemy_health = np.full(players, s.enemy_health, np.int32)
+
+    for step in range(steps):
+        alive = lives > 0
+
+        # Players wander (the dead stay put), enemies step towards their player along the longer axis
+        direction = rng.integers(0, 4, players, dtype=np.int8) | (~alive * np.int8(4))
+        player_x += np.take(STEP_X, direction)
+        player_y += np.take(STEP_Y, direction)
+        np.clip(player_x, -s.arena, s.arena, out=player_x)
+        np.clip(player_y, -s.arena, s.arena, out=player_y)
+        offset_x = player_x - enemy_x
+        offset_y = player_y - enemy_y
+        along_x = np.abs(offset_x) >= np.abs(offset_y)
+        enemy_x += np.where(along_x, np.sign(offset_x), 0).astype(np.int16)
+        enemy_y += np.where(along_x, 0, np.sign(offset_y)).astype(np.int16)
+
+        # Adjacent (or overlapping) pairs trade attacks
+        distance = np.abs(player_x - enemy_x) + np.abs(player_y - enemy_y)
+        engaged = np.flatnonzero(alive & (distance <= 1))
+        if len(engaged) == 0:
+            continue
+        enemy_hits = engaged[rng.random(len(engaged), dtype=np.float32) < s.enemy_hit_chance]
+        player_hits = engaged[rng.random(len(engaged), dtype=np.float32) < s.player_hit_chance]
+        health[enemy_hits] -= s.enemy_damage
+        enemy_health[player_hits] -= s.player_damage
+
+        # Defeated enemies score and come back somewhere else
+        defeated = player_hits[enemy_health[player_hits] <= 0]
+        scores[defeated] += s.kill_score
+        enemy_health[defeated] = s.enemy_health
+        enemy_x[defeated] = rng.integers(-s.arena, s.arena + 1, len(defeated), dtype=np.int16)
+        enemy_y[defeated] = rng.integers(-s.arena, s.arena + 1, len(defeated), dtype=np.int16)
+
+        # Out of health: lose a life and start again with full health
+        knocked_out = enemy_hits[health[enemy_hits] <= 0]
+        lives[knocked_out] -= 1
+        health[knocked_out] = s.player_health
+        survival[knocked_out[lives[knocked_out] == 0]] = step + 1
+
+    return BalanceResult(settings, steps, survival, scores, lives)
+
+
+def simulate_chunk(args):
+    return simulate(*args)
+
+
+# Split the players into one batch per worker, each with its own independent random stream
+def run(settings, players, steps, workers=None, seed=0):
+    if players < 1:
+        raise ValueError(f"need at least one player to simulate, got {players}")
+    workers = workers or os.cpu_count() or 1
+    sizes = [players // workers + (1 if i < players % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    jobs = [(settings, size, steps, child) for size, child in zip(sizes, seeds) if size]
+    if len(jobs) == 1:
+        return simulate_chunk(jobs[0])
+    with ProcessPoolExecutor(len(jobs)) as pool:
+        return BalanceResult.merge(list(pool.map(simulate_chunk, jobs)))
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator for the Player/Enemy model")
+    parser.add_argument("--players", type=positive_int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--enemy-damage", type=int_list, default=[10], help="comma-separated values to try")
+    parser.add_argument("--health", type=int_list, default=[100], help="comma-separated values to try")
+    parser.add_argument("--lives", type=int_list, default=[3], help="comma-separated values to try")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        sweep = [BalanceSettings(enemy_damage=damage, player_health=health, lives=lives)
+                 for damage, health, lives in itertools.product(args.enemy_damage, args.health, args.lives)]
+    except ValueError as error:
+        parser.error(str(error))
+
+    for settings in sweep:
+        start = time.perf_counter()
+        result = run(settings, args.players, args.steps, args.workers, args.seed)
+        print(f"{settings} ({time.perf_counter() - start:.1f}s)")
+        for key, value in result.summary().items():
+            print(f"  {key}: {value}")
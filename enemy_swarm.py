@@ -0,0 +1,112 @@
+import itertools
+
+import numpy as np
+
+
+# All enemy tanks of one kind as a struct of arrays (top-left position, speed, health) instead of
+# one sprite each. Movement, the bottom-line check and projectile hits work on whole arrays and
+# drawing is a single Surface.blits call. Removed enemies are compacted out, so the live enemies
+# are always the first `count` entries.
+class EnemySwarm:
+    def __init__(self, image, capacity=64):
+        self.image = image
+        self.width, self.height = image.get_size()
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.speed = np.zeros(capacity, np.int32)
+        self.health = np.zeros(capacity, np.int32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, capacity):
+        for name in ("x", "y", "speed", "health"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    # Add one enemy centred on (x, y), like pygame's rect.center
+    def spawn(self, x, y, health, speed):
+        if self.count == len(self.x):
+            self.grow(2 * len(self.x))
+        i = self.count
+        self.x[i] = x - self.width // 2
+        self.y[i] = y - self.height // 2
+        self.health[i] = health
+        self.speed[i] = speed
+        self.count += 1
+
+    # Add many enemies at once from arrays of centres, speeds and healths
+    def spawn_many(self, x, y, health, speed):
+        n = len(x)
+        if self.count + n > len(self.x):
+            self.grow(max(2 * len(self.x), self.count + n))
+        end = self.count + n
+        self.x[self.count:end] = np.asarray(x) - self.width // 2
+        self.y[self.count:end] = np.asarray(y) - self.height // 2
+        self.health[self.count:end] = health
+        self.speed[self.count:end] = speed
+        self.count = end
+
+    def update(self):
+        self.y[:self.count] += self.speed[:self.count]
+
+    # Number of enemies whose top edge is below the given line
+    def count_below(self, y):
+        return int(np.count_nonzero(self.y[:self.count] > y))
+
+    # Send enemies whose top edge is below the line back up to y (used by the stress test)
+    def wrap(self, limit, y=0):
+        live = self.y[:self.count]
+        live[live > limit] = y
+
+    def clear(self):
+        self.count = 0
+
+    # Keep only the enemies where keep is True
+    def compact(self, keep):
+        n = int(np.count_nonzero(keep))
+        for array in (self.x, self.y, self.speed, self.health):
+            array[:n] = array[:self.count][keep]
+        self.count = n
+
+    # Check each projectile against every live enemy at once, in projectile order, with the same
+    # edge rules as Rect.colliderect. Every enemy a projectile overlaps takes damage; enemies at
+    # zero health are removed and can't be hit by later projectiles.
+    # Returns the number of enemies destroyed and the projectiles that hit something.
+    def hit_by(self, projectiles, damage):
+        n = self.count
+        if n == 0 or not projectiles:
+            return 0, []
+        x, y, health = self.x[:n], self.y[:n], self.health[:n]
+        right, bottom = x + self.width, y + self.height
+
+        # Test every projectile against every enemy in one go; most frames nothing overlaps
+        rects = np.array([projectile.rect for projectile in projectiles], np.int32)
+        px, py = rects[:, 0:1], rects[:, 1:2]
+        overlaps = ((x < px + rects[:, 2:3]) & (right > px) & (y < py + rects[:, 3:4]) & (bottom > py))
+        candidates = np.flatnonzero(overlaps.any(axis=1))
+        if len(candidates) == 0:
+            return 0, []
+
+        # Only the projectiles that touch something are resolved one by one, in order
+        alive = np.ones(n, bool)
+        hits = []
+        for i in candidates:
+            overlap = overlaps[i] & alive
+            if overlap.any():
+                hits.append(projectiles[i])
+                health[overlap] -= damage
+                alive &= health > 0
+        destroyed = n - int(np.count_nonzero(alive))
+        if destroyed:
+            self.compact(alive)
+        return destroyed, hits
+
+    def draw(self, surface):
+        n = self.count
+        if n:
+            positions = np.stack((self.x[:n], self.y[:n]), axis=1).tolist()
+            surface.blits(zip(itertools.repeat(self.image), positions), doreturn=False)
@@ -0,0 +1,138 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+# Overlay colors per phase, in drawing order
+PHASE_COLORS = {
+    "events": (0, 170, 255),
+    "update": (0, 220, 0),
+    "collisions": (255, 140, 0),
+    "draw": (220, 0, 220),
+    "flip": (255, 255, 0),
+    "wait": (90, 90, 90),
+}
+
+
+# Times the phases of a game loop. Call begin_frame() at the top of the loop, mark(phase) at the
+# end of each phase (the time since the previous mark is added to that phase) and end_frame() last.
+# While disabled every call returns straight away, so it can stay in the loop permanently. Marks only
+# count inside a frame opened by begin_frame() while enabled, so turning timing on part way through
+# a frame waits for the next one instead of recording the time since the last timed frame.
+class FrameProfiler:
+    def __init__(self, phases=tuple(PHASE_COLORS), enabled=False, history=240, csv_path=None):
+        self.phases = list(phases)
+        self.history = {phase: deque(maxlen=history) for phase in self.phases}
+        self.totals = deque(maxlen=history)
+        self.overlay = False
+        self.frame = 0
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self._last = 0.0
+        self._open = False  # A frame was started while enabled and hasn't ended yet
+        self._font = None
+
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(["frame"] + [f"{phase}_ms" for phase in self.phases] + ["total_ms"])
+        self.report = enabled  # Print the percentile summary on close()
+        self.requested = enabled or self._csv is not None  # Timing the caller asked for, overlay or not
+        self.enabled = self.requested
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        for phase in self.phases:
+            self.current[phase] = 0.0
+        self._last = time.perf_counter()
+        self._open = True
+
+    def mark(self, phase):
+        if not self._open:
+            return
+        now = time.perf_counter()
+        self.current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if not self._open:
+            return
+        self._open = False
+        self.frame += 1
+        total = 0.0
+        for phase in self.phases:
+            self.history[phase].append(self.current[phase])
+            total += self.current[phase]
+        self.totals.append(total)
+        if self._csv is not None:
+            self._csv.writerow([self.frame] + [f"{self.current[phase] * 1000:.3f}" for phase in self.phases]
+                               + [f"{total * 1000:.3f}"])
+
+    # Rolling percentile over the kept history, in milliseconds
+    def percentile(self, phase, q):
+        samples = sorted(self.totals if phase == "total" else self.history[phase])
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))] * 1000
+
+    def summary(self):
+        return {phase: {q: self.percentile(phase, q) for q in (50, 95, 99)} for phase in self.phases + ["total"]}
+
+    # The overlay needs timings, so showing it turns timing on; hiding it goes back to
+    # whatever was asked for when the profiler was created
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        enabled = self.overlay or self.requested
+        if enabled != self.enabled:
+            self._open = False  # Drop the partly timed frame; timing (re)starts at the next begin_frame()
+        self.enabled = enabled
+
+    def draw(self, screen, x=10, y=None, height=100, budget_ms=1000 / 60):
+        if not self.overlay:
+            return
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 20)
+        width = self.totals.maxlen
+        if y is None:
+            y = screen.get_height() - height - 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        scale = height / (2 * budget_ms)  # The frame budget sits half way up the graph
+
+        # One stacked bar per frame
+        for i in range(len(self.totals)):
+            bottom = height
+            for phase in self.phases:
+                bar = self.history[phase][i] * 1000 * scale
+                if bar >= 1:
+                    pygame.draw.line(panel, PHASE_COLORS.get(phase, (255, 255, 255)),
+                                     (i, bottom), (i, max(0, bottom - bar)))
+                bottom -= bar
+        pygame.draw.line(panel, (255, 0, 0), (0, height // 2), (width, height // 2))
+        screen.blit(panel, (x, y))
+
+        # Percentile table next to the graph
+        text_y = y
+        for phase in self.phases + ["total"]:
+            line = (f"{phase:<10} p50 {self.percentile(phase, 50):5.2f}  "
+                    f"p95 {self.percentile(phase, 95):5.2f}  p99 {self.percentile(phase, 99):5.2f} ms")
+            text = self._font.render(line, True, PHASE_COLORS.get(phase, (255, 255, 255)))
+            screen.blit(text, (x + width + 10, text_y))
+            text_y += 16
+
+    def print_summary(self):
+        print(f"Frame phase timings over the last {len(self.totals)} of {self.frame} frames (ms):")
+        for phase, percentiles in self.summary().items():
+            print(f"  {phase:<10} p50 {percentiles[50]:6.2f}  p95 {percentiles[95]:6.2f}  p99 {percentiles[99]:6.2f}")
+
+    def close(self):
+        if self.report and self.frame:
+            self.print_summary()
+            self.report = False
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv = None
@@ -0,0 +1,75 @@
+import struct
+import zlib
+
+# File layout: header, final game state, then the zlib-compressed input bytes (one per frame)
+MAGIC = b"TSRP"
+VERSION = 2  # 2: recordings start on the guide screen and include the lives-left pauses
+HEADER = struct.Struct("<4sBQI")  # magic, version, RNG seed, frame count
+STATE = struct.Struct("<6i")  # final state, see scrolling_Game.Game.final_state()
+
+# Bits of the per-frame input byte; the top four bits hold the number of shots fired that frame
+LEFT = 0x01
+RIGHT = 0x02
+RESTART = 0x04  # Enter on the guide, Y on the game-over screen
+QUIT = 0x08
+MAX_SHOTS = 15
+
+MAX_SEED = 2 ** 64 - 1  # The header stores the seed as an unsigned 64-bit value
+
+
+# Everything the tank shooter reads from the player in one frame
+class FrameInput:
+    def __init__(self, left=False, right=False, shots=0, restart=False, quit=False):
+        self.left = left
+        self.right = right
+        self.shots = shots
+        self.restart = restart
+        self.quit = quit
+
+    def to_byte(self):
+        return ((LEFT if self.left else 0) | (RIGHT if self.right else 0)
+                | (RESTART if self.restart else 0) | (QUIT if self.quit else 0)
+                | min(self.shots, MAX_SHOTS) << 4)
+
+    @classmethod
+    def from_byte(cls, value):
+        return cls(bool(value & LEFT), bool(value & RIGHT), value >> 4, bool(value & RESTART), bool(value & QUIT))
+
+
+# Collects the input of every frame and writes it out together with the seed and the final state
+class InputRecorder:
+    def __init__(self, seed):
+        # Checked up front so a bad seed fails before the session rather than when saving it
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"seed {seed} can't be recorded, it must be between 0 and {MAX_SEED}")
+        self.seed = seed
+        self.frames = bytearray()
+
+    def add(self, frame_input):
+        self.frames.append(frame_input.to_byte())
+
+    def save(self, path, final_state):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, len(self.frames)))
+            f.write(STATE.pack(*final_state))
+            f.write(zlib.compress(bytes(self.frames), 9))
+
+
+class Recording:
+    def __init__(self, seed, inputs, final_state):
+        self.seed = seed
+        self.inputs = inputs
+        self.final_state = final_state
+
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, frame_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} tank shooter recording")
+    final_state = STATE.unpack_from(data, HEADER.size)
+    frames = zlib.decompress(data[HEADER.size + STATE.size:])
+    if len(frames) != frame_count:
+        raise ValueError(f"{path} is truncated: expected {frame_count} frames, found {len(frames)}")
+    return Recording(seed, [FrameInput.from_byte(value) for value in frames], final_state)
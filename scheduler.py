@@ -0,0 +1,38 @@
+import heapq
+import itertools
+
+
+# Runs callbacks a number of ticks in the future without blocking. The owner calls advance() once
+# per tick (a game frame), so timed transitions stay deterministic when a session is replayed.
+class Scheduler:
+    def __init__(self):
+        self.now = 0
+        self.pending = []  # Heap of [due tick, sequence, callback]; callback is None once cancelled
+        self.sequence = itertools.count()  # Keeps timers due on the same tick in the order they were added
+
+    def after(self, ticks, callback):
+        timer = [self.now + ticks, next(self.sequence), callback]
+        heapq.heappush(self.pending, timer)
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer[2] = None  # Dropped from the heap when it comes due
+
+    def advance(self, ticks=1):
+        self.now += ticks
+        while self.pending and self.pending[0][0] <= self.now:
+            callback = heapq.heappop(self.pending)[2]
+            if callback is not None:
+                callback()
+
+    # Ticks left until the next live timer fires, or None if nothing is scheduled
+    def ticks_until_next(self):
+        while self.pending and self.pending[0][2] is None:
+            heapq.heappop(self.pending)
+        if not self.pending:
+            return None
+        return max(0, self.pending[0][0] - self.now)
+
+    def clear(self):
+        self.pending.clear()
@@ -1,5 +1,23 @@
 import pygame
 import random
+import argparse
+import array
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from frame_profiler import FrameProfiler
+from enemy_swarm import EnemySwarm
+from input_recording import MAX_SEED, MAX_SHOTS, FrameInput, InputRecorder, load_recording
+from scheduler import Scheduler
+from sprite_pool import PooledSprite, SpritePool, frame_time_stats
 
 # Initialize Pygame
 pygame.init()
@@ -17,13 +35,37 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 DARK_RED = (200, 0, 0)
 
-# Game screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Tank Shooter Game")
-
 # Clock
 clock = pygame.time.Clock()
 
+# Scenes of the game; Game.step() and Game.draw() dispatch on the current one
+GUIDE = "guide"
+PLAYING = "playing"
+LIFE_LOST = "life_lost"
+LEVEL_UP = "level_up"
+GAME_OVER = "game_over"
+
+LIFE_LOST_FRAMES = 120  # How long the lives-left screen stays up (2 seconds)
+LEVEL_UP_FRAMES = 60  # How long the level-up message is shown
+
+# Scenes that don't change on their own; main() sleeps in pygame.event.wait() on these
+# instead of redrawing at 60 FPS, waking for input or the next scheduled transition
+IDLE_SCENES = (GUIDE, LIFE_LOST, GAME_OVER)
+FPS = 60
+FRAME_TIME = 1.0 / FPS
+
+# --soak fails if memory keeps growing by more than this per game after warm-up
+SOAK_HEAP_BUDGET = 1024  # Traced Python heap, bytes per game
+SOAK_RSS_BUDGET = 16 * 1024  # Process RSS, bytes per game; RSS moves in whole pages so allow more
+
+# Fonts are created once per size and shared by every screen and every restart
+fonts = {}
+
+def get_font(size):
+    if size not in fonts:
+        fonts[size] = pygame.font.SysFont(None, size)
+    return fonts[size]
+
 # Player (Tank) Class
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -32,16 +74,18 @@ class Player(pygame.sprite.Sprite):
         self.image.fill(GREEN)  # Green color for tank
         pygame.draw.rect(self.image, BLACK, [10, 10, 30, 10])  # Turret
         self.rect = self.image.get_rect()
-        self.rect.center = [x, y]
         self.speed = 5
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.center = [x, y]
         self.health = 100
         self.lives = 3
 
-    def move(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
+    def move(self, frame_input):
+        if frame_input.left:
             self.rect.x -= self.speed
-        if keys[pygame.K_RIGHT]:
+        if frame_input.right:
             self.rect.x += self.speed
 
         # Keep the player within the screen bounds
@@ -51,47 +95,50 @@ class Player(pygame.sprite.Sprite):
             self.rect.x = SCREEN_WIDTH - self.rect.width
 
     def shoot(self):
-        projectile = Projectile(self.rect.centerx, self.rect.top)
+        projectile = projectile_pool.acquire(self.rect.centerx, self.rect.top)
         return projectile
 
-    def update(self):
-        self.move()
+    def update(self, frame_input):
+        self.move(frame_input)
 
 # Projectile Class
-class Projectile(pygame.sprite.Sprite):
+class Projectile(PooledSprite):
     def __init__(self, x, y):
         super().__init__()
         self.image = pygame.Surface((10, 5))
         self.image.fill(RED)  # Red color for projectiles
         self.rect = self.image.get_rect()
-        self.rect.center = [x, y]
         self.speed = -7
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.center = [x, y]
 
     def update(self):
         self.rect.y += self.speed
         if self.rect.y < 0:  # Off-screen
             self.kill()
 
-# Enemy Class
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, health, speed):
-        super().__init__()
-        self.image = pygame.Surface((40, 30))
-        self.image.fill(RED)  # Enemy tanks are red
-        self.rect = self.image.get_rect()
-        self.rect.center = [x, y]
-        self.health = health
-        self.speed = speed
+# Enemy tanks: one shared image, with positions, speeds and health kept in an EnemySwarm
+ENEMY_HEALTH = 50
+PROJECTILE_DAMAGE = 50  # One hit destroys an enemy
 
-    def move(self):
-        self.rect.y += self.speed
+def make_enemy_image():
+    image = pygame.Surface((40, 30))
+    image.fill(RED)  # Enemy tanks are red
+    if pygame.display.get_surface() is not None:
+        image = image.convert()  # Match the screen's pixel format so blits don't convert every frame
+    return image
 
-    def update(self):
-        self.move()
+# Killed projectiles are kept here and reused instead of building new sprites and surfaces
+projectile_pool = SpritePool(Projectile, 32)
 
 # Scoreboard and HUD Class
 class Scoreboard:
     def __init__(self):
+        self.reset()
+
+    def reset(self):
         self.score = 0
         self.level = 1
 
@@ -102,7 +149,7 @@ class Scoreboard:
         self.score = 0
 
     def draw(self, screen, player):
-        font = pygame.font.SysFont(None, 36)
+        font = get_font(36)
         score_text = font.render(f"Score: {self.score}", True, WHITE)
         level_text = font.render(f"Level: {self.level}", True, WHITE)
         lives_text = font.render(f"Lives: {player.lives}", True, WHITE)
@@ -114,180 +161,451 @@ class Scoreboard:
         screen.blit(health_text, (10, GAME_AREA_HEIGHT + 100))
 
     def display_game_over(self, screen):
-        font = pygame.font.SysFont(None, 72)
+        font = get_font(72)
         game_over_text = font.render("GAME OVER", True, RED)
         screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2 - 50))
 
     def display_play_again(self, screen):
-        font = pygame.font.SysFont(None, 36)
+        font = get_font(36)
         play_again_text = font.render("Play Again? Press Y for Yes, N for No", True, WHITE)
         screen.blit(play_again_text, (SCREEN_WIDTH // 2 - 250, SCREEN_HEIGHT // 2 + 50))
 
     def display_level_up(self, screen):
-        font = pygame.font.SysFont(None, 72)
+        font = get_font(72)
         level_up_text = font.render(f"Level {self.level}", True, GREEN)
         screen.blit(level_up_text, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50))
 
     def display_lives_left(self, screen, player):
-        font = pygame.font.SysFont(None, 72)
+        font = get_font(72)
         lives_left_text = font.render(f"{player.lives} Lives Left", True, WHITE)
         screen.blit(lives_left_text, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50))
 
-# Function to pause and display lives left
-def display_lives_left_pause(screen, player, scoreboard, seconds):
+# Lives-left screen shown between losing a life and playing on
+def display_lives_left_pause(screen, player, scoreboard):
     screen.fill(BLACK)
     scoreboard.draw(screen, player)
     scoreboard.display_lives_left(screen, player)
-    pygame.display.flip()
-    pygame.time.delay(seconds * 1000)  # Pause for the specified seconds
+
+# The guide text is rendered once and reused every time the guide is shown
+guide_surfaces = []
 
 # User Guide Screen Function
 def show_user_guide(screen):
     screen.fill(BLACK)
-    font = pygame.font.SysFont(None, 36)
-
-    guide_lines = [
-        "HOW TO PLAY:",
-        "1. Use LEFT and RIGHT arrow keys to move the tank.",
-        "2. Press 'Z' to shoot at enemies.",
-        "3. If an enemy reaches the bottom, you lose a life.",
-        "4. You have 3 lives. If you lose all lives, it's game over.",
-        "5. Score 100 points to level up, and enemies get faster.",
-        "6. Your score resets after each level.",
-        "",
-        "Press 'Enter' to Start the Game!"
-    ]
+
+    if not guide_surfaces:
+        font = get_font(36)
+        guide_lines = [
+            "HOW TO PLAY:",
+            "1. Use LEFT and RIGHT arrow keys to move the tank.",
+            "2. Press 'Z' to shoot at enemies.",
+            "3. If an enemy reaches the bottom, you lose a life.",
+            "4. You have 3 lives. If you lose all lives, it's game over.",
+            "5. Score 100 points to level up, and enemies get faster.",
+            "6. Your score resets after each level.",
+            "",
+            "Press 'Enter' to Start the Game!"
+        ]
+        guide_surfaces.extend(font.render(line, True, WHITE) for line in guide_lines)
 
     y_offset = 100
-    for line in guide_lines:
-        guide_text = font.render(line, True, WHITE)
+    for guide_text in guide_surfaces:
         screen.blit(guide_text, (SCREEN_WIDTH // 2 - 300, y_offset))
         y_offset += 40
 
-    pygame.display.flip()
-
-    # Wait for user to press "Enter" to start the game
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                waiting = False  # Exit loop and start the game
+# Game state and per-frame logic, driven by FrameInput so it can be played live or replayed from a recording.
+# Everything is built once in __init__; reset() puts it back to the start in place, so restarting
+# allocates nothing new and memory stays flat however many games are played.
+class Game:
+    def __init__(self, seed=None, profiler=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)  # Always seeded so sessions can be recorded
+        self.rng = random.Random(self.seed)
+        self.profiler = profiler if profiler is not None else FrameProfiler()  # Disabled unless one is passed in
+        self.player = Player(SCREEN_WIDTH // 2, GAME_AREA_HEIGHT - 50)
+        self.scoreboard = Scoreboard()
+        self.projectiles = pygame.sprite.Group()
+        self.enemies = EnemySwarm(make_enemy_image())
+        self.scheduler = Scheduler()  # Timed scene transitions, advanced once per frame
+        self.scene_timer = None
+        self.running = True
+        self.reset()
+
+    def reset(self):
+        projectile_pool.release_all(self.projectiles)
+        self.projectiles.empty()
+        self.enemies.clear()
+
+        self.player.reset(SCREEN_WIDTH // 2, GAME_AREA_HEIGHT - 50)
+        self.scoreboard.reset()
+
+        self.enemy_spawn_timer = 100  # Time between enemy spawns
+        self.enemy_spawn_counter = 0
+
+        self.enemy_speed = 2  # Initial enemy speed for level 1
+        self.scheduler.clear()
+        self.scene_timer = None
+        self.set_scene(GUIDE)  # Display user guide before starting the game
+
+    # Switch scene; a timed scene (frames > 0) moves on by itself through end_scene()
+    def set_scene(self, scene, frames=0):
+        self.scene = scene
+        self.scheduler.cancel(self.scene_timer)
+        self.scene_timer = self.scheduler.after(frames, self.end_scene) if frames else None
+
+    def end_scene(self):
+        self.scene_timer = None
+        if self.scene == LIFE_LOST:
+            self.set_scene(GAME_OVER if self.player.lives <= 0 else PLAYING)
+        elif self.scene == LEVEL_UP:
+            self.set_scene(PLAYING)
+
+    @property
+    def game_over(self):
+        return self.scene == GAME_OVER
+
+    def step(self, frame_input):
+        if frame_input.quit:
+            self.running = False
+            return
+
+        self.scheduler.advance()
+
+        if self.scene == GUIDE:
+            if frame_input.restart:  # 'Enter' starts the game
+                self.set_scene(PLAYING)
+        elif self.scene == GAME_OVER:
+            if frame_input.restart:  # 'Y' plays again
+                self.reset()
+        elif self.scene != LIFE_LOST:
+            self.step_playing(frame_input)
+
+    def step_playing(self, frame_input):
+        for _ in range(frame_input.shots):
+            self.projectiles.add(self.player.shoot())
+
+        # Update player, projectiles, and enemies
+        self.player.update(frame_input)
+        self.projectiles.update()
+        self.enemies.update()
+        self.profiler.mark("update")
+
+        # Check for projectile-enemy collisions
+        destroyed, hits = self.enemies.hit_by(self.projectiles.sprites(), PROJECTILE_DAMAGE)
+        self.scoreboard.increase_score(10 * destroyed)
+        for projectile in hits:
+            projectile.kill()
+        self.profiler.mark("collisions")
+
+        # Check if the score reaches 100 and level up
+        if self.scoreboard.score >= 100:
+            self.scoreboard.level += 1
+            self.scoreboard.reset_score()
+            self.set_scene(LEVEL_UP, LEVEL_UP_FRAMES)  # Display the level-up message for a short time
+            self.enemy_speed += 2  # Increase enemy speed with each level
+
+        # Spawn enemies
+        if self.enemy_spawn_counter > self.enemy_spawn_timer:
+            x_pos = self.rng.randint(0, SCREEN_WIDTH - 40)
+            self.enemies.spawn(x_pos, 0, ENEMY_HEALTH, self.enemy_speed)
+            self.enemy_spawn_counter = 0
+        else:
+            self.enemy_spawn_counter += 1
+        self.profiler.mark("update")
+
+        # Check if any enemies reach the bottom
+        reached = self.enemies.count_below(GAME_AREA_HEIGHT)
+        if reached:
+            self.player.lives -= reached  # Every enemy that got through costs a life
+            self.enemies.clear()  # Clear all enemies
+            self.set_scene(LIFE_LOST, LIFE_LOST_FRAMES)
+        self.profiler.mark("collisions")
+
+    def draw(self, screen):
+        if self.scene == GUIDE:
+            show_user_guide(screen)
+        elif self.scene == LIFE_LOST:
+            display_lives_left_pause(screen, self.player, self.scoreboard)
+        elif self.scene == GAME_OVER:
+            screen.fill(BLACK)
+            self.scoreboard.display_game_over(screen)
+            self.scoreboard.display_play_again(screen)  # Ask if the player wants to play again
+        else:
+            screen.fill(BLACK)
 
-# Main Game Loop
-def main():
-    show_user_guide(screen)  # Display user guide before starting the game
+            # Draw the game area (80%)
+            pygame.draw.rect(screen, GREEN, [0, GAME_AREA_HEIGHT, SCREEN_WIDTH, 5])  # Green bottom line
+            screen.blit(self.player.image, self.player.rect)
+            self.projectiles.draw(screen)
+            self.enemies.draw(screen)
 
-    player = Player(SCREEN_WIDTH // 2, GAME_AREA_HEIGHT - 50)
-    projectiles = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    scoreboard = Scoreboard()
+            # Draw the HUD (20%)
+            self.scoreboard.draw(screen, self.player)
 
-    enemy_spawn_timer = 100  # Time between enemy spawns
-    enemy_spawn_counter = 0
+            # Display level-up message if leveling up
+            if self.scene == LEVEL_UP:
+                self.scoreboard.display_level_up(screen)
 
-    enemy_speed = 2  # Initial enemy speed for level 1
-    game_over = False
-    display_level_up_message = False
-    level_up_timer = 60  # Time to display the level-up message
-    lives_lost_pause = False  # Pause after life is lost
+    # Checked at the end of a replay against the state stored in the recording
+    def final_state(self):
+        return (self.scoreboard.level, self.scoreboard.score, self.player.lives, self.player.health,
+                self.player.rect.x, len(self.enemies))
 
-    running = True
-    while running:
-        for event in pygame.event.get():
+# Main Game Loop
+def main(profiler=None, seed=None, record_path=None):
+    profiler = profiler if profiler is not None else FrameProfiler()  # Disabled unless one is passed in
+
+    # Game screen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tank Shooter Game")
+
+    game = Game(seed, profiler)
+    recorder = InputRecorder(game.seed) if record_path else None
+
+    drawn_scene = None  # Scene currently on screen; idle scenes are only redrawn when something changes
+    last_step = time.perf_counter()
+    accumulator = 0.0  # Real time a timed idle scene hasn't turned into frames yet
+    pending_input = None  # Input that arrived before a whole idle frame had passed
+    while game.running:
+        profiler.begin_frame()
+        idle = game.scene in IDLE_SCENES and not profiler.overlay
+        if idle and drawn_scene == game.scene:
+            # Sleep until input arrives or the next timed transition is due, instead of spinning
+            ticks = game.scheduler.ticks_until_next()
+            timeout = 0  # Waits forever
+            if ticks is not None:
+                timeout = max(1, round((ticks * FRAME_TIME - accumulator) * 1000))
+            events = [event for event in [pygame.event.wait(timeout)] + pygame.event.get()
+                      if event.type != pygame.NOEVENT]
+        else:
+            events = pygame.event.get()
+        profiler.mark("wait")
+
+        frame_input = FrameInput()
+        for event in events:
             if event.type == pygame.QUIT:
-                running = False
+                frame_input.quit = True
 
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_z and not game_over:
-                    projectile = player.shoot()
-                    projectiles.add(projectile)
+                if event.key == pygame.K_z:
+                    frame_input.shots += 1
+
+                # Wait for user to press "Enter" to start the game
+                if game.scene == GUIDE and event.key == pygame.K_RETURN:
+                    frame_input.restart = True
 
                 # Handle input when game over and asking to play again
-                if game_over:
+                if game.game_over:
                     if event.key == pygame.K_y:  # Restart game
-                        main()  # Restart the game
+                        frame_input.restart = True
                     elif event.key == pygame.K_n:  # Quit game
-                        running = False  # Exit the game loop
+                        frame_input.quit = True  # Exit the game loop
 
-        if not game_over:
-            # Update player, projectiles, and enemies
-            player.update()
-            projectiles.update()
+                if event.key == pygame.K_F3:  # Toggle the profiler overlay
+                    profiler.toggle_overlay()
 
-            # Only update enemies and spawn new ones if not paused after losing a life
-            if not lives_lost_pause:
-                enemies.update()
-
-                # Check for projectile-enemy collisions
-                for projectile in projectiles:
-                    enemy_hit_list = pygame.sprite.spritecollide(projectile, enemies, True)
-                    for enemy in enemy_hit_list:
-                        scoreboard.increase_score(10)
-                        projectile.kill()
-
-                # Check if the score reaches 100 and level up
-                if scoreboard.score >= 100:
-                    scoreboard.level += 1
-                    scoreboard.reset_score()
-                    display_level_up_message = True
-                    enemy_speed += 2  # Increase enemy speed with each level
-
-                # Display the level-up message for a short time
-                if display_level_up_message:
-                    level_up_timer -= 1
-                    if level_up_timer <= 0:
-                        display_level_up_message = False
-                        level_up_timer = 60
-
-                # Spawn enemies
-                if enemy_spawn_counter > enemy_spawn_timer:
-                    x_pos = random.randint(0, SCREEN_WIDTH - 40)
-                    enemy = Enemy(x_pos, 0, 50, enemy_speed)
-                    enemies.add(enemy)
-                    enemy_spawn_counter = 0
+        keys = pygame.key.get_pressed()
+        frame_input.left = keys[pygame.K_LEFT]
+        frame_input.right = keys[pygame.K_RIGHT]
+        if pending_input is not None:
+            frame_input.shots += pending_input.shots
+            frame_input.restart = frame_input.restart or pending_input.restart
+            frame_input.quit = frame_input.quit or pending_input.quit
+            pending_input = None
+        frame_input.shots = min(frame_input.shots, MAX_SHOTS)  # A recording holds at most this many per frame
+        profiler.mark("events")
+
+        # One frame per loop while playing. A timed idle scene runs only as many frames as real time
+        # has passed, stopping at its transition so the next scene gets drawn on time; waking up early
+        # for an event runs no frame and keeps the input for the next one (quitting never waits).
+        steps = 1
+        now = time.perf_counter()
+        ticks = game.scheduler.ticks_until_next()
+        if idle and ticks is not None:
+            accumulator += now - last_step
+            steps = min(int(accumulator / FRAME_TIME), ticks)
+            accumulator -= steps * FRAME_TIME
+            if steps == 0:
+                if frame_input.quit:
+                    steps = 1
                 else:
-                    enemy_spawn_counter += 1
-
-                # Check if any enemies reach the bottom
-                for enemy in enemies:
-                    if enemy.rect.y > GAME_AREA_HEIGHT:
-                        player.lives -= 1
-                        enemies.empty()  # Clear all enemies
+                    pending_input = frame_input
+        else:
+            accumulator = 0.0
+        last_step = now
+        for i in range(steps):
+            step_input = frame_input if i == 0 else FrameInput()
+            if recorder is not None:
+                recorder.add(step_input)
+            game.step(step_input)
+
+        # Drawing
+        animated = game.scene not in IDLE_SCENES or profiler.overlay
+        if animated or events or drawn_scene != game.scene:
+            game.draw(screen)
+            profiler.draw(screen, y=10)
+            profiler.mark("draw")
+
+            pygame.display.flip()
+            profiler.mark("flip")
+            drawn_scene = game.scene
+
+        if animated:
+            clock.tick(FPS)
+            profiler.mark("wait")
+        profiler.end_frame()
+
+    if recorder is not None:
+        recorder.save(record_path, game.final_state())
+    profiler.close()
+    pygame.quit()
 
-                        if player.lives > 0:
-                            display_lives_left_pause(screen, player, scoreboard, 2)
-                        else:
-                            game_over = True
-                            display_lives_left_pause(screen, player, scoreboard, 2)
+# Resident set size of this process in bytes. It includes what tracemalloc can't see, such as SDL
+# surface pixels. Falls back to the peak RSS where /proc isn't available, and 0 if neither is.
+def process_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, KiB elsewhere
+
+# Least-squares growth per game of a list of memory samples, in bytes
+def growth_per_game(samples):
+    n = len(samples)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(samples) / n
+    covariance = sum((i - mean_x) * (value - mean_y) for i, value in enumerate(samples))
+    return covariance / sum((i - mean_x) ** 2 for i in range(n))
+
+# Play unlimited games back to back with random input, restarting in place each time, and track
+# the traced Python heap and the process RSS after every game.
+# Returns the heap sizes and the RSS after each restart, in bytes.
+def soak(games, seed=0, draw_every=10):
+    game = Game(seed)
+    rng = random.Random(seed)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    confirm = FrameInput(restart=True)
+    heap = array.array("q", bytes(8 * games))  # Preallocated so recording a sample doesn't grow the heap
+    rss = array.array("q", bytes(8 * games))
+    tracemalloc.start()
+    try:
+        for i in range(games):
+            game.step(confirm)  # Leave the guide
+            frame = 0
+            while not game.game_over:
+                game.step(FrameInput(rng.random() < 0.3, rng.random() < 0.3, int(rng.random() < 0.05)))
+                if frame % draw_every == 0:
+                    game.draw(surface)
+                frame += 1
+            game.draw(surface)
+            game.step(confirm)  # Play again
+            gc.collect()
+            heap[i] = tracemalloc.get_traced_memory()[0]
+            rss[i] = process_rss()
+    finally:
+        tracemalloc.stop()
+    return heap, rss
+
+# Ramp the enemy count up to max_enemies in equal steps and measure the frame rate at each one.
+# Enemies fall and wrap back to the top, one projectile is fired per frame and everything is drawn.
+# Projectiles still collide but do no damage, so each step runs at exactly its enemy count.
+# Returns a list of (enemies, frames per second).
+def stress(max_enemies=10000, steps=10, frames=120, seed=0):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tank Shooter Game - stress test")
+    rng = random.Random(seed)
+    enemies = EnemySwarm(make_enemy_image())
+    projectiles = pygame.sprite.Group()
+    player = Player(SCREEN_WIDTH // 2, GAME_AREA_HEIGHT - 50)
+    curve = []
+    for step in range(1, steps + 1):
+        new = max_enemies * step // steps - len(enemies)
+        enemies.spawn_many([rng.randint(20, SCREEN_WIDTH - 20) for _ in range(new)],
+                           [rng.randint(0, GAME_AREA_HEIGHT) for _ in range(new)],
+                           ENEMY_HEALTH, [rng.randint(1, 4) for _ in range(new)])
+        start = time.perf_counter()
+        for _ in range(frames):
+            pygame.event.pump()
+            player.rect.centerx = rng.randint(0, SCREEN_WIDTH)
+            projectiles.add(player.shoot())
+            projectiles.update()
+            enemies.update()
+            enemies.wrap(GAME_AREA_HEIGHT)
+            destroyed, hits = enemies.hit_by(projectiles.sprites(), 0)  # No damage, to hold the enemy count
+            for projectile in hits:
+                projectile.kill()
 
-            # Drawing
             screen.fill(BLACK)
-
-            if game_over:
-                scoreboard.display_game_over(screen)
-                scoreboard.display_play_again(screen)  # Ask if the player wants to play again
-            else:
-                # Draw the game area (80%)
-                pygame.draw.rect(screen, GREEN, [0, GAME_AREA_HEIGHT, SCREEN_WIDTH, 5])  # Green bottom line
-                screen.blit(player.image, player.rect)
-                projectiles.draw(screen)
-                enemies.draw(screen)
-
-                # Draw the HUD (20%)
-                scoreboard.draw(screen, player)
-
-                # Display level-up message if leveling up
-                if display_level_up_message:
-                    scoreboard.display_level_up(screen)
-
-        pygame.display.flip()
-        clock.tick(60)
-
-    pygame.quit()
+            enemies.draw(screen)
+            projectiles.draw(screen)
+            pygame.display.flip()
+        curve.append((len(enemies), frames / (time.perf_counter() - start)))
+    projectile_pool.release_all(projectiles)
+    projectiles.empty()
+    return curve
+
+# Play a recording back as fast as possible, without a window or frame cap.
+# Returns whether the final state matches the recorded one, the final state and the step times.
+def replay(path, draw=False):
+    recording = load_recording(path)
+    game = Game(recording.seed)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if draw else None
+    frame_times = []
+    for frame_input in recording.inputs:
+        start = time.perf_counter()
+        game.step(frame_input)
+        if surface is not None:
+            game.draw(surface)
+        frame_times.append(time.perf_counter() - start)
+    state = game.final_state()
+    return state == tuple(recording.final_state), state, frame_times
 
 if __name__ == "__main__":
-    main()
-
+    parser = argparse.ArgumentParser(description="Tank Shooter Game")
+    parser.add_argument("--seed", type=int, default=None, help="seed for enemy spawning")
+    parser.add_argument("--record", metavar="PATH", help="record every frame's input to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recording headless at full speed and check it")
+    parser.add_argument("--replay-draw", action="store_true", help="also render each replayed frame off-screen")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each phase of the loop and print p50/p95/p99 on exit (F3 shows the overlay)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="write per-frame phase timings to a CSV file")
+    parser.add_argument("--soak", type=int, metavar="GAMES",
+                        help="play GAMES games headless, restarting in place, and fail if memory keeps growing")
+    parser.add_argument("--stress", type=int, nargs="?", const=10000, metavar="ENEMIES",
+                        help="ramp up to ENEMIES enemies (default 10000) and report the FPS at each step")
+    args = parser.parse_args()
+    if args.record and args.seed is not None and not 0 <= args.seed <= MAX_SEED:
+        parser.error(f"--seed must be between 0 and {MAX_SEED} to be recorded")
+
+    if args.stress:
+        for count, fps in stress(args.stress):
+            print(f"{count:6d} enemies: {fps:7.1f} FPS")
+        sys.exit(0)
+
+    if args.soak:
+        heap, rss = soak(args.soak, args.seed or 0)
+        warm = min(len(heap) - 1, max(1, len(heap) // 10))  # Let fonts, pools and caches fill up first
+        heap_growth = growth_per_game(heap[warm:])
+        rss_growth = growth_per_game(rss[warm:])
+        print(f"{len(heap)} games, after warm-up / last game: traced heap {heap[warm] / 1024:.1f} / "
+              f"{heap[-1] / 1024:.1f} KiB, RSS {rss[warm] / 2**20:.1f} / {rss[-1] / 2**20:.1f} MiB")
+        print(f"trend per game: traced heap {heap_growth / 1024:+.2f} KiB, RSS {rss_growth / 1024:+.2f} KiB")
+        leaking = heap_growth > SOAK_HEAP_BUDGET or rss_growth > SOAK_RSS_BUDGET
+        sys.exit(1 if leaking else 0)
+
+    if args.replay:
+        start = time.perf_counter()
+        matches, state, frame_times = replay(args.replay, args.replay_draw)
+        elapsed = time.perf_counter() - start
+        print(f"{len(frame_times)} frames in {elapsed:.2f}s ({len(frame_times) / 60 / elapsed:.0f}x real time)")
+        print(f"frame times: {frame_time_stats(frame_times)}")
+        print(f"final state (level, score, lives, health, x, enemies): {state} "
+              f"{'matches' if matches else 'DOES NOT MATCH'} the recording")
+        sys.exit(0 if matches else 1)
+
+    main(FrameProfiler(enabled=args.profile, csv_path=args.profile_csv), args.seed, args.record)
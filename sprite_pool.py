@@ -0,0 +1,109 @@
+import gc
+import time
+
+import pygame
+
+
+# Sprite that returns itself to its pool when killed instead of becoming garbage
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+    in_pool = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+# Free-list of one sprite type. Subclasses of PooledSprite build their surfaces in __init__
+# and put everything that changes per spawn in reset(), which acquire() calls on reuse
+class SpritePool:
+    def __init__(self, sprite_class, max_size=32):
+        self.sprite_class = sprite_class
+        self.max_size = max_size  # Most idle sprites kept around; 0 disables reuse
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.in_pool = False
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+            self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        if sprite.in_pool:  # kill() can be called more than once on the same sprite
+            return
+        if len(self.free) < self.max_size:
+            sprite.in_pool = True
+            self.free.append(sprite)
+            self.released += 1
+        else:
+            sprite.pool = None  # Pool is full, let this one be collected
+            self.dropped += 1
+
+    # Release sprites removed with Group.empty(), which doesn't call kill()
+    def release_all(self, sprites):
+        for sprite in sprites:
+            self.release(sprite)
+
+    def stats(self):
+        return {
+            "type": self.sprite_class.__name__,
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "dropped": self.dropped,
+            "free": len(self.free),
+            "in_use": self.created - self.dropped - len(self.free),
+        }
+
+
+# Times every garbage collector run while it is started, via gc.callbacks
+class GCMonitor:
+    def __init__(self):
+        self.pauses = []  # (generation, seconds)
+        self._start = None
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.append((info["generation"], time.perf_counter() - self._start))
+            self._start = None
+
+    def start(self):
+        self.pauses = []
+        gc.callbacks.append(self._callback)
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def summary(self):
+        total = sum(seconds for _, seconds in self.pauses)
+        longest = max((seconds for _, seconds in self.pauses), default=0.0)
+        return {"collections": len(self.pauses), "total_ms": total * 1000, "max_ms": longest * 1000}
+
+
+# Frame time summary in milliseconds; spikes are frames over twice the median
+def frame_time_stats(frame_times):
+    times = sorted(frame_times)
+    if not times:
+        return {"frames": 0, "median_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "spikes": 0}
+    median = times[len(times) // 2]
+    return {
+        "frames": len(times),
+        "median_ms": median * 1000,
+        "p99_ms": times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+        "max_ms": times[-1] * 1000,
+        "spikes": sum(1 for t in times if t > 2 * median),
+    }